@@ -20,27 +20,44 @@ Usage:
 """
 
 import asyncio
+import functools
 import json
 import logging
 import math
 import random
 import socket
+import sys
 import time
-from collections import defaultdict
+from collections import OrderedDict, defaultdict, deque
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Deque, Dict, Hashable, List, Optional, Set, Tuple
 
+import msgspec
+import numpy as np
 import yaml
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 import uvicorn
 
+# orjson is much faster than stdlib json on the broadcast path
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    json_dumps = orjson.dumps
+else:
+    def json_dumps(obj) -> bytes:
+        """Encode object as UTF-8 JSON bytes"""
+        return json.dumps(obj).encode('utf-8')
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -97,9 +114,10 @@ def get_default_config() -> dict:
         'system': {
             'stale_timeout_s': 5,
             'udp_buffer_size': 1024,
+            'udp_socket_rcvbuf': 4 * 1024 * 1024,
+            'ws_queue_size': 4,
         },
         'advanced': {
-            'strict_json_validation': True,
             'deduplicate_packets': True,
             'dedup_window_ms': 1000,
             'enable_statistics': True,
@@ -109,6 +127,20 @@ def get_default_config() -> dict:
 # Global configuration
 CONFIG = load_config()
 
+# Hot-path settings bound once at startup (these sections are never changed
+# at runtime; mutable settings such as simulate_units are still read live)
+NEAR_M = CONFIG['volume_model']['near_distance_m']
+FAR_M = CONFIG['volume_model']['far_distance_m']
+CUTOFF_M = CONFIG['volume_model']['cutoff_distance_m']
+MIN_VOLUME = CONFIG['volume_model']['min_volume']
+MAX_VOLUME = CONFIG['volume_model']['max_volume']
+VOLUME_CURVE = CONFIG['volume_model']['curve_type']
+QUALITY_THRESHOLD = CONFIG['volume_model']['quality_threshold']
+QUALITY_WEIGHTING = CONFIG['volume_model']['apply_quality_weighting']
+DEDUP_ENABLED = CONFIG['advanced']['deduplicate_packets']
+DEDUP_WINDOW_S = CONFIG['advanced']['dedup_window_ms'] / 1000.0
+CSV_EXPORT_ENABLED = CONFIG['persistence'].get('csv_export_enabled', False)
+
 # Setup logging
 def setup_logging():
     """Configure logging based on config"""
@@ -137,6 +169,25 @@ logger = logging.getLogger(__name__)
 # DATA MODELS
 # =============================================================================
 
+class UnitPacket(msgspec.Struct):
+    """
+    UDP packet from a unit (ranging, heartbeat or status).
+    
+    Decoded and type-checked in one pass by msgspec; range checks are done
+    in UDPListener._validate_packet. Ranging packets carry no 'type'.
+    """
+    node: str
+    type: Optional[str] = None
+    peer: str = ''
+    distance: float = -1.0
+    quality: float = -1.0
+    ts: Optional[int] = None
+    rssi: Optional[int] = None
+    msg: str = ''
+
+# Reused decoder for UnitPacket
+PACKET_DECODER = msgspec.json.Decoder(UnitPacket)
+
 @dataclass
 class DistanceMeasurement:
     """Single distance measurement from a unit"""
@@ -159,19 +210,23 @@ class NodeStatus:
     ip_address: Optional[str] = None
     heartbeat_count: int = 0
     
-    def is_online(self, timeout: float = 10.0) -> bool:
+    def is_online(self, timeout: float = 10.0, now: Optional[float] = None) -> bool:
         """Check if node is considered online"""
-        return (time.time() - self.last_seen) < timeout
+        return self.time_since_seen(now) < timeout
     
-    def time_since_seen(self) -> float:
+    def time_since_seen(self, now: Optional[float] = None) -> float:
         """Get time since last seen in seconds"""
-        return time.time() - self.last_seen
+        if now is None:
+            now = time.time()
+        return now - self.last_seen
     
-    def to_dict(self) -> dict:
+    def to_dict(self, now: Optional[float] = None) -> dict:
+        if now is None:
+            now = time.time()
         return {
             'node': self.node_id,
-            'online': self.is_online(),
-            'last_seen': round(self.time_since_seen(), 1),
+            'online': self.is_online(now=now),
+            'last_seen': round(self.time_since_seen(now), 1),
             'rssi': self.rssi,
             'ip': self.ip_address,
             'heartbeats': self.heartbeat_count
@@ -187,34 +242,113 @@ class PairState:
     volume: float
     last_update: float
     
-    def is_stale(self, timeout: float) -> bool:
+    def is_stale(self, timeout: float, now: Optional[float] = None) -> bool:
         """Check if data is stale"""
-        return (time.time() - self.last_update) > timeout
+        if now is None:
+            now = time.time()
+        return (now - self.last_update) > timeout
     
-    def to_dict(self) -> dict:
+    def to_dict(self, now: Optional[float] = None) -> dict:
+        if now is None:
+            now = time.time()
         return {
             'a': self.node_a,
             'b': self.node_b,
             'd': round(self.distance, 2),
             'q': round(self.quality, 2),
             'vol': round(self.volume, 2),
-            'age': round(time.time() - self.last_update, 1)
+            'age': round(now - self.last_update, 1)
         }
 
+class PairTable:
+    """
+    Latest state of every unit pair, stored as parallel arrays.
+    
+    Row i holds node_a[i]/node_b[i] and the matching numeric columns, so a
+    snapshot can filter and round all pairs in one vectorized pass.
+    """
+    
+    def __init__(self, capacity: int = 64):
+        self.index: Dict[Tuple[str, str], int] = {}
+        self.node_a: List[str] = []
+        self.node_b: List[str] = []
+        self.distance = np.zeros(capacity)
+        self.quality = np.zeros(capacity)
+        self.volume = np.zeros(capacity)
+        self.last_update = np.zeros(capacity)
+    
+    def __len__(self) -> int:
+        return len(self.node_a)
+    
+    def update(self, pair_key: Tuple[str, str], distance: float, quality: float,
+               volume: float, last_update: float):
+        """Update or create the row for a (sorted) pair key"""
+        i = self.index.get(pair_key)
+        if i is None:
+            i = len(self.node_a)
+            if i == len(self.distance):
+                self._grow()
+            self.index[pair_key] = i
+            self.node_a.append(pair_key[0])
+            self.node_b.append(pair_key[1])
+        
+        self.distance[i] = distance
+        self.quality[i] = quality
+        self.volume[i] = volume
+        self.last_update[i] = last_update
+    
+    def _grow(self):
+        """Double the capacity of the numeric columns"""
+        extra = len(self.distance)
+        self.distance = np.concatenate([self.distance, np.zeros(extra)])
+        self.quality = np.concatenate([self.quality, np.zeros(extra)])
+        self.volume = np.concatenate([self.volume, np.zeros(extra)])
+        self.last_update = np.concatenate([self.last_update, np.zeros(extra)])
+    
+    def active_indices(self, timeout: float, now: float) -> np.ndarray:
+        """Row indices of pairs updated within timeout seconds"""
+        n = len(self.node_a)
+        return np.nonzero((now - self.last_update[:n]) <= timeout)[0]
+    
+    def values(self):
+        """Iterate rows as PairState objects"""
+        for i in range(len(self.node_a)):
+            yield PairState(
+                node_a=self.node_a[i],
+                node_b=self.node_b[i],
+                distance=float(self.distance[i]),
+                quality=float(self.quality[i]),
+                volume=float(self.volume[i]),
+                last_update=float(self.last_update[i])
+            )
+    
+    def clear(self):
+        """Remove all pairs (capacity is kept)"""
+        self.index.clear()
+        self.node_a.clear()
+        self.node_b.clear()
+
 class SystemState:
     """Global system state manager"""
     
     def __init__(self):
-        self.pairs: Dict[Tuple[str, str], PairState] = {}
+        self.pairs = PairTable()
         self.nodes: Set[str] = set()
+        self._nodes_sorted: Optional[List[str]] = None  # Memoized sorted(self.nodes)
         self.node_status: Dict[str, NodeStatus] = {}  # Track node status
         self.measurements_received = 0
         self.last_measurement_time = 0
         self.start_time = time.time()
+        self._stale_timeout = CONFIG['system']['stale_timeout_s']
+        # Latest snapshot and its JSON encoding, written by the broadcaster
+        self._cached_snapshot: Optional[dict] = None
+        self._cached_json: Optional[bytes] = None
         
-    def update_heartbeat(self, node_id: str, rssi: Optional[int] = None, ip_address: Optional[str] = None):
+    def update_heartbeat(self, node_id: str, rssi: Optional[int] = None, ip_address: Optional[str] = None,
+                         now: Optional[float] = None):
         """Update node status from heartbeat packet"""
-        now = time.time()
+        if now is None:
+            now = time.time()
         
         if node_id in self.node_status:
             # Update existing node status
@@ -236,22 +370,34 @@ class SystemState:
             )
         
         # Also track in nodes set
-        self.nodes.add(node_id)
+        self._track_node(node_id)
         
         logger.debug(f"Heartbeat from node {node_id}, RSSI: {rssi}, IP: {ip_address}")
     
-    def update_measurement(self, measurement: DistanceMeasurement):
-        """Update state with new measurement"""
+    def _track_node(self, node_id: str):
+        """Add node to the known set, invalidating the sorted cache if new"""
+        if node_id not in self.nodes:
+            self.nodes.add(node_id)
+            self._nodes_sorted = None
+    
+    def clear(self):
+        """Remove all nodes and pairs"""
+        self.nodes.clear()
+        self.pairs.clear()
+        self._nodes_sorted = None
+    
+    def update_measurement(self, measurement: DistanceMeasurement) -> float:
+        """Update state with new measurement; returns the computed volume"""
         # Normalize pair order (A-B same as B-A)
-        pair_key = tuple(sorted([measurement.node, measurement.peer]))
+        a, b = measurement.node, measurement.peer
+        pair_key = (a, b) if a <= b else (b, a)
         
         # Calculate volume
         volume = calculate_volume(measurement.distance, measurement.quality)
         
         # Update or create pair state
-        self.pairs[pair_key] = PairState(
-            node_a=pair_key[0],
-            node_b=pair_key[1],
+        self.pairs.update(
+            pair_key,
             distance=measurement.distance,
             quality=measurement.quality,
             volume=volume,
@@ -259,51 +405,67 @@ class SystemState:
         )
         
         # Track nodes
-        self.nodes.add(measurement.node)
-        self.nodes.add(measurement.peer)
+        self._track_node(measurement.node)
+        self._track_node(measurement.peer)
         
         # Update statistics
         self.measurements_received += 1
         self.last_measurement_time = measurement.received_at
         
+        return volume
+        
     def get_snapshot(self) -> dict:
         """Get current state snapshot for broadcasting"""
-        stale_timeout = CONFIG['system']['stale_timeout_s']
+        stale_timeout = self._stale_timeout
+        now = time.time()
         
-        # Filter out stale pairs
+        # Filter out stale pairs and round all columns in one pass
+        table = self.pairs
+        idx = table.active_indices(stale_timeout, now)
+        rows = idx.tolist()
+        node_a = [table.node_a[i] for i in rows]
+        node_b = [table.node_b[i] for i in rows]
         active_pairs = [
-            pair.to_dict() 
-            for pair in self.pairs.values()
-            if not pair.is_stale(stale_timeout)
+            {'a': a, 'b': b, 'd': d, 'q': q, 'vol': vol, 'age': age}
+            for a, b, d, q, vol, age in zip(
+                node_a,
+                node_b,
+                np.round(table.distance[idx], 2).tolist(),
+                np.round(table.quality[idx], 2).tolist(),
+                np.round(table.volume[idx], 2).tolist(),
+                np.round(now - table.last_update[idx], 1).tolist()
+            )
         ]
         
         # Only show nodes that have active pairs
-        active_nodes = set()
-        for pair in active_pairs:
-            active_nodes.add(pair['a'])
-            active_nodes.add(pair['b'])
+        active_nodes = set(node_a)
+        active_nodes.update(node_b)
+        
+        # Known nodes only change occasionally, so keep them pre-sorted
+        if self._nodes_sorted is None:
+            self._nodes_sorted = sorted(self.nodes)
         
         # Get node status for all known nodes
         node_status_list = [
-            status.to_dict() 
+            status.to_dict(now) 
             for status in self.node_status.values()
         ]
         
         return {
-            'nodes': sorted(list(active_nodes)),
+            'nodes': [n for n in self._nodes_sorted if n in active_nodes],
             'pairs': active_pairs,
             'node_status': node_status_list,  # Include detailed node status
             'config': {
-                'near_m': CONFIG['volume_model']['near_distance_m'],
-                'far_m': CONFIG['volume_model']['far_distance_m'],
-                'cutoff_m': CONFIG['volume_model']['cutoff_distance_m'],
+                'near_m': NEAR_M,
+                'far_m': FAR_M,
+                'cutoff_m': CUTOFF_M,
             },
             'stats': {
                 'total_measurements': self.measurements_received,
                 'active_pairs': len(active_pairs),
-                'uptime_s': round(time.time() - self.start_time, 1)
+                'uptime_s': round(now - self.start_time, 1)
             },
-            'timestamp': time.time()
+            'timestamp': now
         }
     
     def get_csv_data(self) -> List[dict]:
@@ -331,7 +493,8 @@ def calculate_volume(distance: float, quality: float) -> float:
     """
     Calculate simulated audio volume based on distance and quality.
     
-    Models how audio volume decreases with distance.
+    Models how audio volume decreases with distance. Inputs are quantized
+    to 0.01 (1 cm / 1% quality) so repeated readings hit the memoized model.
     
     Args:
         distance: Distance in meters
@@ -340,23 +503,26 @@ def calculate_volume(distance: float, quality: float) -> float:
     Returns:
         Volume level (0.0-1.0)
     """
-    config = CONFIG['volume_model']
+    return _calc_volume_impl(round(distance, 2), round(quality, 2))
+
+@functools.lru_cache(maxsize=4096)
+def _calc_volume_impl(distance: float, quality: float) -> float:
+    """Volume model proper, memoized over quantized inputs"""
+    near = NEAR_M
+    far = FAR_M
+    min_vol = MIN_VOLUME
+    max_vol = MAX_VOLUME
+    curve = VOLUME_CURVE
     
     # Check quality threshold
-    if quality < config['quality_threshold']:
+    if quality < QUALITY_THRESHOLD:
         return 0.0
     
     # Check cutoff distance
-    if distance >= config['cutoff_distance_m']:
+    if distance >= CUTOFF_M:
         return 0.0
     
     # Distance-based volume calculation
-    near = config['near_distance_m']
-    far = config['far_distance_m']
-    min_vol = config['min_volume']
-    max_vol = config['max_volume']
-    curve = config['curve_type']
-    
     if distance <= near:
         # Within near distance: maximum volume
         volume = max_vol
@@ -380,7 +546,6 @@ def calculate_volume(distance: float, quality: float) -> float:
         
         elif curve == 'logarithmic':
             # Logarithmic falloff (gentler than inverse square)
-            import math
             volume = max_vol - (max_vol - min_vol) * math.log1p(t * 10) / math.log1p(10)
         
         else:
@@ -388,7 +553,7 @@ def calculate_volume(distance: float, quality: float) -> float:
             volume = max_vol - t * (max_vol - min_vol)
     
     # Apply quality weighting if enabled
-    if config['apply_quality_weighting']:
+    if QUALITY_WEIGHTING:
         volume *= quality
     
     # Clamp to valid range
@@ -400,15 +565,42 @@ def calculate_volume(distance: float, quality: float) -> float:
 # UDP LISTENER
 # =============================================================================
 
+class RangingProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol feeding received packets to the UDP listener"""
+    
+    def __init__(self, listener: 'UDPListener'):
+        self.listener = listener
+    
+    def datagram_received(self, data: bytes, addr: tuple):
+        self.listener._process_packet_bytes(data, addr)
+    
+    def error_received(self, exc: Exception):
+        logger.error(f"Error in UDP listener: {exc}")
+
 class UDPListener:
     """Async UDP listener for distance measurements"""
     
+    # Max datagrams read per socket readiness event (Linux drain path)
+    DRAIN_BATCH = 32
+    
     def __init__(self):
         self.socket = None
+        self.transport = None
+        self._reader_loop = None
+        # Receive buffer reused for every datagram on the drain path
+        self._recv_buf = bytearray(CONFIG['system']['udp_buffer_size'])
+        self._recv_mv = memoryview(self._recv_buf)
         self.running = False
         self.packets_received = 0
         self.packets_invalid = 0
-        self.dedup_cache: Dict[str, float] = {}
+        # Signature -> last seen time, oldest first (TTL cache)
+        self.dedup_cache: 'OrderedDict[Hashable, float]' = OrderedDict()
+        self._dedup_last_purge = 0.0
+        # Formatted CSV lines waiting for the periodic flusher
+        self._csv_queue: Deque[str] = deque(maxlen=10000)
+        self._csv_fp = None
+        self._csv_task = None
+        self._csv_path = Path(CONFIG['persistence']['csv_export_path'])
         
     async def start(self):
         """Start UDP listener"""
@@ -421,32 +613,72 @@ class UDPListener:
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.socket.bind((address, port))
-        self.socket.setblocking(False)
+        
+        # Enlarge kernel receive buffer to absorb bursts from many units
+        rcvbuf = CONFIG['system'].get('udp_socket_rcvbuf', 4 * 1024 * 1024)
+        try:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+        except OSError as e:
+            logger.warning(f"Could not set SO_RCVBUF to {rcvbuf}: {e}")
+        actual = self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        logger.info(f"UDP receive buffer: {actual} bytes (requested {rcvbuf})")
+        
+        loop = asyncio.get_running_loop()
+        if sys.platform == 'linux':
+            # Drain bursts straight from the socket on each readiness event
+            self.socket.setblocking(False)
+            loop.add_reader(self.socket.fileno(), self._drain_socket)
+            self._reader_loop = loop
+        else:
+            # Hand the socket to the event loop; packets arrive via RangingProtocol
+            self.transport, _ = await loop.create_datagram_endpoint(
+                lambda: RangingProtocol(self),
+                sock=self.socket
+            )
         
         self.running = True
         
-        # Run listener loop
-        while self.running:
+        # Create the CSV directory once instead of on every write
+        if CSV_EXPORT_ENABLED:
+            self._csv_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Batch CSV writes instead of touching the file per packet
+        self._csv_task = asyncio.create_task(self._csv_flusher())
+    
+    def _drain_socket(self):
+        """
+        Read up to DRAIN_BATCH queued datagrams from the socket.
+        
+        Each datagram is received into the shared buffer and handed on as a
+        memoryview, so _process_packet_bytes must consume it synchronously
+        before the next read overwrites it.
+        """
+        for _ in range(self.DRAIN_BATCH):
             try:
-                await self._receive_packet()
-            except Exception as e:
+                nbytes, addr = self.socket.recvfrom_into(self._recv_buf)
+            except (BlockingIOError, InterruptedError):
+                # Kernel queue drained
+                return
+            except OSError as e:
                 logger.error(f"Error in UDP listener: {e}")
-                await asyncio.sleep(0.1)
+                return
+            
+            self._process_packet_bytes(self._recv_mv[:nbytes], addr)
     
-    async def _receive_packet(self):
-        """Receive and process one UDP packet"""
-        loop = asyncio.get_event_loop()
-        buffer_size = CONFIG['system']['udp_buffer_size']
+    def _process_packet_bytes(self, data, addr: tuple):
+        """Decode, validate and process one UDP packet (bytes or memoryview)"""
+        self.packets_received += 1
+        now = time.time()
         
         try:
-            # Async receive
-            data, addr = await loop.sock_recvfrom(self.socket, buffer_size)
-            self.packets_received += 1
-            
-            # Decode JSON
+            # Decode JSON and check field types
             try:
-                packet = json.loads(data.decode('utf-8'))
-            except json.JSONDecodeError as e:
+                packet = PACKET_DECODER.decode(data)
+            except msgspec.ValidationError as e:
+                logger.warning(f"Invalid packet from {addr}: {e}")
+                self.packets_invalid += 1
+                return
+            except msgspec.DecodeError as e:
                 logger.warning(f"Invalid JSON from {addr}: {e}")
                 self.packets_invalid += 1
                 return
@@ -458,140 +690,113 @@ class UDPListener:
                 return
             
             # Check for duplicate
-            if self._is_duplicate(packet):
+            if self._is_duplicate(packet, now):
                 logger.debug(f"Duplicate packet ignored: {packet}")
                 return
             
             # Process measurement
-            self._process_packet(packet, addr)
-            
-        except BlockingIOError:
-            # No data available
-            await asyncio.sleep(0.01)
+            self._process_packet(packet, addr, now)
+        
+        except Exception as e:
+            logger.error(f"Error in UDP listener: {e}")
     
-    def _validate_packet(self, packet: dict) -> bool:
-        """Validate packet structure"""
-        packet_type = packet.get('type')
+    def _validate_packet(self, packet: UnitPacket) -> bool:
+        """Validate packet field values (types are checked by the decoder)"""
+        packet_type = packet.type
         
         # Handle heartbeat packets
         if packet_type == 'heartbeat':
             # Heartbeat packets only need 'node' and 'type'
-            try:
-                node = str(packet.get('node', ''))
-                if len(node) != 1:
-                    return False
-                return True
-            except (ValueError, TypeError):
-                return False
+            return len(packet.node) == 1
         
         # Handle status packets (diagnostics, startup, etc.)
         if packet_type == 'status':
             # Status packets need 'node', 'type', and 'msg'
-            try:
-                node = str(packet.get('node', ''))
-                msg = str(packet.get('msg', ''))
-                if len(node) != 1 or not msg:
-                    return False
-                return True
-            except (ValueError, TypeError):
-                return False
-        
-        # For ranging packets, check standard fields
-        required_fields = ['node', 'peer', 'distance', 'quality']
-        
-        # Check required fields
-        if CONFIG['advanced']['strict_json_validation']:
-            if not all(field in packet for field in required_fields):
-                return False
-        
-        # Validate types and ranges
-        try:
-            node = str(packet.get('node', ''))
-            peer = str(packet.get('peer', ''))
-            distance = float(packet.get('distance', -1))
-            quality = float(packet.get('quality', -1))
-            
-            if len(node) != 1 or len(peer) != 1:
-                return False
-            if distance < 0 or distance > 100:  # Sanity check
-                return False
-            if quality < 0 or quality > 1:
-                return False
-            
-            return True
-            
-        except (ValueError, TypeError):
+            return len(packet.node) == 1 and bool(packet.msg)
+        
+        # For ranging packets, check standard fields (missing ones keep
+        # out-of-range defaults and are rejected below)
+        if len(packet.node) != 1 or len(packet.peer) != 1:
             return False
+        if packet.distance < 0 or packet.distance > 100:  # Sanity check
+            return False
+        if packet.quality < 0 or packet.quality > 1:
+            return False
+        
+        return True
     
-    def _is_duplicate(self, packet: dict) -> bool:
+    def _is_duplicate(self, packet: UnitPacket, now: Optional[float] = None) -> bool:
         """Check if packet is a duplicate (recent same measurement)"""
-        if not CONFIG['advanced']['deduplicate_packets']:
+        if not DEDUP_ENABLED:
             return False
         
         # Skip duplicate checking for heartbeat and status packets
-        packet_type = packet.get('type')
-        if packet_type in ('heartbeat', 'status'):
+        if packet.type in ('heartbeat', 'status'):
             return False
         
         # Create packet signature for ranging packets
-        sig = f"{packet['node']}-{packet['peer']}-{packet['distance']:.2f}"
+        sig = (packet.node, packet.peer, round(packet.distance * 100))
         
-        now = time.time()
-        window = CONFIG['advanced']['dedup_window_ms'] / 1000.0
+        if now is None:
+            now = time.time()
+        window = DEDUP_WINDOW_S
+        cache = self.dedup_cache
         
         # Check cache
-        if sig in self.dedup_cache:
-            last_time = self.dedup_cache[sig]
-            if now - last_time < window:
-                return True
-        
-        # Update cache
-        self.dedup_cache[sig] = now
-        
-        # Clean old entries
-        self.dedup_cache = {
-            k: v for k, v in self.dedup_cache.items()
-            if now - v < window
-        }
+        last_time = cache.get(sig)
+        if last_time is not None and now - last_time < window:
+            return True
+        
+        # Update cache, keeping entries ordered by last seen time
+        cache[sig] = now
+        cache.move_to_end(sig)
+        
+        # Clean old entries from the front, at most once per second
+        if now - self._dedup_last_purge > 1.0:
+            self._dedup_last_purge = now
+            while cache and now - next(iter(cache.values())) >= window:
+                cache.popitem(last=False)
         
         return False
     
-    def _process_packet(self, packet: dict, addr: tuple):
+    def _process_packet(self, packet: UnitPacket, addr: tuple, now: Optional[float] = None):
         """Process valid packet (measurement, heartbeat, or status)"""
-        packet_type = packet.get('type')
+        if now is None:
+            now = time.time()
+        packet_type = packet.type
         
         # Handle heartbeat packets
         if packet_type == 'heartbeat':
-            node_id = packet['node']
-            rssi = packet.get('rssi')
+            node_id = packet.node
+            rssi = packet.rssi
             ip_address = addr[0]  # Get IP from UDP address
             
             logger.debug(f"Heartbeat from node {node_id} at {ip_address}, RSSI: {rssi}")
             
             # Update node status in global state
-            state.update_heartbeat(node_id, rssi, ip_address)
+            state.update_heartbeat(node_id, rssi, ip_address, now)
             return
         
         # Handle status packets (diagnostics, startup, etc.)
         if packet_type == 'status':
-            node_id = packet['node']
-            msg = packet.get('msg', 'unknown')
+            node_id = packet.node
+            msg = packet.msg
             ip_address = addr[0]
             
             logger.info(f"Status from node {node_id} at {ip_address}: {msg}")
             
             # Update node status to mark it as seen
-            state.update_heartbeat(node_id, None, ip_address)
+            state.update_heartbeat(node_id, None, ip_address, now)
             return
         
         # Handle ranging measurement packets
         measurement = DistanceMeasurement(
-            node=packet['node'],
-            peer=packet['peer'],
-            distance=packet['distance'],
-            quality=packet['quality'],
-            timestamp=packet.get('ts', int(time.time())),
-            received_at=time.time()
+            node=packet.node,
+            peer=packet.peer,
+            distance=packet.distance,
+            quality=packet.quality,
+            timestamp=packet.ts if packet.ts is not None else int(now),
+            received_at=now
         )
         
         logger.debug(f"Received: {measurement.node}->{measurement.peer} "
@@ -599,36 +804,54 @@ class UDPListener:
         
         # Update node status for the sending node (from ranging packet too)
         ip_address = addr[0]
-        state.update_heartbeat(measurement.node, None, ip_address)
+        state.update_heartbeat(measurement.node, None, ip_address, now)
         
         # Update global state
-        state.update_measurement(measurement)
+        volume = state.update_measurement(measurement)
         
         # Optional: Write to CSV
-        if CONFIG['persistence'].get('csv_export_enabled'):
-            self._append_to_csv(measurement)
+        if CSV_EXPORT_ENABLED:
+            self._append_to_csv(measurement, volume)
     
-    def _append_to_csv(self, measurement: DistanceMeasurement):
-        """Append measurement to CSV file (only real data, not simulation)"""
+    def _append_to_csv(self, measurement: DistanceMeasurement, volume: float):
+        """Queue measurement for CSV export (only real data, not simulation)"""
         # Skip saving simulation data to CSV
         if CONFIG['advanced'].get('simulate_units', False):
             return
-            
+        
+        ts = datetime.fromtimestamp(measurement.received_at).isoformat()
+        self._csv_queue.append(
+            f'{ts},{measurement.node},{measurement.peer},'
+            f'{measurement.distance:.3f},{measurement.quality:.3f},{volume:.3f}\n'
+        )
+    
+    async def _csv_flusher(self):
+        """Periodically write queued CSV lines to disk"""
+        interval = CONFIG['ui']['broadcast_interval_ms'] / 1000.0
+        
+        while self.running:
+            await asyncio.sleep(interval)
+            self._flush_csv()
+    
+    def _flush_csv(self):
+        """Write all queued CSV lines in one batch"""
+        if not self._csv_queue:
+            return
+        
         try:
-            csv_path = Path(CONFIG['persistence']['csv_export_path'])
-            csv_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Create header if file doesn't exist
-            write_header = not csv_path.exists()
-            
-            with open(csv_path, 'a') as f:
-                if write_header:
-                    f.write('timestamp,node,peer,distance_m,quality,volume\n')
+            # Open the CSV once and keep it for the listener's lifetime
+            if self._csv_fp is None:
+                self._csv_fp = open(self._csv_path, 'a')
                 
-                ts = datetime.fromtimestamp(measurement.received_at).isoformat()
-                volume = calculate_volume(measurement.distance, measurement.quality)
-                f.write(f'{ts},{measurement.node},{measurement.peer},'
-                       f'{measurement.distance:.3f},{measurement.quality:.3f},{volume:.3f}\n')
+                # Create header if the file is new or empty (append mode
+                # starts at end of file, so no separate stat() is needed)
+                if self._csv_fp.tell() == 0:
+                    self._csv_fp.write('timestamp,node,peer,distance_m,quality,volume\n')
+            
+            lines = list(self._csv_queue)
+            self._csv_queue.clear()
+            self._csv_fp.writelines(lines)
+            self._csv_fp.flush()
         
         except Exception as e:
             logger.error(f"Error writing to CSV: {e}")
@@ -637,8 +860,22 @@ class UDPListener:
         """Stop UDP listener"""
         logger.info("Stopping UDP listener")
         self.running = False
-        if self.socket:
+        if self._reader_loop and self.socket:
+            self._reader_loop.remove_reader(self.socket.fileno())
+            self._reader_loop = None
+        if self.transport:
+            self.transport.close()
+        elif self.socket:
             self.socket.close()
+        
+        # Write out anything still queued and close the CSV
+        if self._csv_task:
+            self._csv_task.cancel()
+            self._csv_task = None
+        self._flush_csv()
+        if self._csv_fp:
+            self._csv_fp.close()
+            self._csv_fp = None
 
 # Global UDP listener
 udp_listener = UDPListener()
@@ -777,44 +1014,58 @@ simulation = SimulationMode()
 # WEBSOCKET MANAGER
 # =============================================================================
 
+@dataclass
+class ClientChannel:
+    """Outbound queue and relay task for one WebSocket client"""
+    websocket: WebSocket
+    queue: asyncio.Queue
+    task: Optional[asyncio.Task] = None
+
 class WebSocketManager:
     """Manage WebSocket connections and broadcasting"""
     
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Dict[WebSocket, ClientChannel] = {}
         self.broadcast_task = None
         
     async def connect(self, websocket: WebSocket):
         """Accept new WebSocket connection"""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        channel = ClientChannel(
+            websocket=websocket,
+            queue=asyncio.Queue(maxsize=CONFIG['system'].get('ws_queue_size', 4))
+        )
+        channel.task = asyncio.create_task(self._relay(channel))
+        self.active_connections[websocket] = channel
         logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
         
     def disconnect(self, websocket: WebSocket):
         """Remove WebSocket connection"""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        channel = self.active_connections.pop(websocket, None)
+        if channel and channel.task and channel.task is not asyncio.current_task():
+            channel.task.cancel()
         logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
     
-    async def broadcast(self, message: dict):
-        """Broadcast message to all connected clients"""
-        if not self.active_connections:
-            return
-        
-        json_message = json.dumps(message)
-        
-        # Send to all connections, remove dead ones
-        dead_connections = []
-        for connection in self.active_connections:
+    async def _relay(self, channel: ClientChannel):
+        """Send queued payloads to one client until it goes away"""
+        while True:
+            payload = await channel.queue.get()
             try:
-                await connection.send_text(json_message)
+                await channel.websocket.send_bytes(payload)
             except Exception as e:
                 logger.warning(f"Error sending to WebSocket: {e}")
-                dead_connections.append(connection)
-        
-        # Clean up dead connections
-        for connection in dead_connections:
-            self.disconnect(connection)
+                self.disconnect(channel.websocket)
+                return
+    
+    async def broadcast(self, payload: bytes):
+        """Queue pre-encoded JSON payload for all connected clients"""
+        for channel in self.active_connections.values():
+            try:
+                channel.queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                # Slow client: drop its oldest pending snapshot
+                channel.queue.get_nowait()
+                channel.queue.put_nowait(payload)
     
     async def start_broadcasting(self):
         """Start periodic broadcast task"""
@@ -823,11 +1074,14 @@ class WebSocketManager:
         
         while True:
             try:
-                # Get current state snapshot
+                # Get current state snapshot, encoded once for all clients
                 snapshot = state.get_snapshot()
+                payload = json_dumps(snapshot)
+                state._cached_snapshot = snapshot
+                state._cached_json = payload
                 
                 # Broadcast to all clients
-                await self.broadcast(snapshot)
+                await self.broadcast(payload)
                 
                 # Wait for next interval
                 await asyncio.sleep(interval)
@@ -854,8 +1108,15 @@ async def lifespan(app: FastAPI):
     logger.info(f"UDP port: {CONFIG['network']['udp_listen_port']}")
     logger.info(f"HTTP/WS port: {CONFIG['network']['rest_port']}")
     logger.info(f"Volume model: {CONFIG['volume_model']['curve_type']}")
+    loop_cls = type(asyncio.get_running_loop())
+    logger.info(f"Event loop: {loop_cls.__module__}.{loop_cls.__name__}")
     logger.info("=" * 60)
     
+    # Start tasks eagerly so ones that never suspend skip a loop round trip
+    # (Python 3.12+)
+    if hasattr(asyncio, 'eager_task_factory'):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    
     # Create data/logs directories
     Path("./data").mkdir(exist_ok=True)
     Path("./logs").mkdir(exist_ok=True)
@@ -919,9 +1180,11 @@ async def websocket_endpoint(websocket: WebSocket):
     await ws_manager.connect(websocket)
     try:
         while True:
-            # Keep connection alive, waiting for client messages
+            # Suspend until the client sends something or disconnects
             # (Client doesn't send anything in this POC, just receives)
-            await asyncio.sleep(1)
+            message = await websocket.receive()
+            if message['type'] == 'websocket.disconnect':
+                raise WebSocketDisconnect(message.get('code', 1000))
     except WebSocketDisconnect:
         ws_manager.disconnect(websocket)
     except Exception as e:
@@ -929,8 +1192,13 @@ async def websocket_endpoint(websocket: WebSocket):
         ws_manager.disconnect(websocket)
 
 @app.get("/api/snapshot")
-async def api_snapshot():
-    """Get current system state snapshot"""
+async def api_snapshot(fresh: bool = False):
+    """Get current system state snapshot (?fresh=1 forces a recompute)"""
+    # Serve the broadcaster's snapshot unless it missed more than one tick
+    max_age = 2 * CONFIG['ui']['broadcast_interval_ms'] / 1000.0
+    cached = state._cached_snapshot
+    if not fresh and cached is not None and time.time() - cached['timestamp'] <= max_age:
+        return Response(content=state._cached_json, media_type='application/json')
     return JSONResponse(state.get_snapshot())
 
 @app.get("/api/export")
@@ -967,12 +1235,13 @@ async def api_export():
 @app.get("/api/stats")
 async def api_stats():
     """Get system statistics"""
+    now = time.time()
+    stale_timeout = state._stale_timeout
     return JSONResponse({
-        'uptime_s': round(time.time() - state.start_time, 1),
+        'uptime_s': round(now - state.start_time, 1),
         'measurements_received': state.measurements_received,
         'active_nodes': len(state.nodes),
-        'active_pairs': len([p for p in state.pairs.values() 
-                            if not p.is_stale(CONFIG['system']['stale_timeout_s'])]),
+        'active_pairs': len(state.pairs.active_indices(stale_timeout, now)),
         'udp_packets_received': udp_listener.packets_received,
         'udp_packets_invalid': udp_listener.packets_invalid,
         'websocket_clients': len(ws_manager.active_connections),
@@ -999,16 +1268,14 @@ async def toggle_simulation():
         if simulation.running:
             simulation.stop()
         # Clear old state data before starting new simulation
-        state.nodes.clear()
-        state.pairs.clear()
+        state.clear()
         # Start new simulation task
         asyncio.create_task(simulation.start())
     else:
         logger.info("Simulation mode disabled")
         simulation.stop()
         # Clear state when simulation is disabled
-        state.nodes.clear()
-        state.pairs.clear()
+        state.clear()
         logger.info("State cleared - all nodes and pairs removed")
     
     return JSONResponse({
@@ -1045,8 +1312,7 @@ async def update_node_count(request: dict):
         CONFIG['advanced']['simulation_unit_count'] = node_count
         
         # Clear old state data first
-        state.nodes.clear()
-        state.pairs.clear()
+        state.clear()
         
         # Restart simulation if it's running
         if simulation.running:
@@ -1085,8 +1351,6 @@ if static_dir.exists():
 # =============================================================================
 
 if __name__ == "__main__":
-    import sys
-    
     # Print startup banner
     print("\n" + "="*60)
     print("  UWB Proximity Chat - Hub Server")
@@ -1097,11 +1361,19 @@ if __name__ == "__main__":
     print(f"Simulation mode: {'ON' if CONFIG['advanced']['simulate_units'] else 'OFF'}")
     print("="*60 + "\n")
     
+    # Prefer uvloop (libuv) over the default selector event loop
+    try:
+        import uvloop  # noqa: F401
+        loop_impl = "uvloop"
+    except ImportError:
+        loop_impl = "asyncio"
+    
     # Run server with minimal logging
     uvicorn.run(
         "server:app",
         host=CONFIG['network']['rest_host'],
         port=CONFIG['network']['rest_port'],
+        loop=loop_impl,
         log_level="warning",  # Less verbose logging
         reload=False,  # Disable reload for cleaner output
         access_log=False  # Disable access logs for cleaner output
@@ -40,6 +40,8 @@ const AppState = {
 // WEBSOCKET CONNECTION
 // =============================================================================
 
+const wsTextDecoder = new TextDecoder('utf-8');
+
 /**
  * Initialize WebSocket connection
  */
@@ -54,6 +56,8 @@ function initWebSocket() {
     
     try {
         AppState.ws = new WebSocket(AppState.wsUrl);
+        // Hub sends snapshots as binary frames of UTF-8 JSON
+        AppState.ws.binaryType = 'arraybuffer';
         
         AppState.ws.onopen = onWebSocketOpen;
         AppState.ws.onmessage = onWebSocketMessage;
@@ -83,7 +87,10 @@ function onWebSocketOpen(event) {
  */
 function onWebSocketMessage(event) {
     try {
-        const data = JSON.parse(event.data);
+        const text = typeof event.data === 'string'
+            ? event.data
+            : wsTextDecoder.decode(event.data);
+        const data = JSON.parse(text);
         
         // Update state
         AppState.data = data;